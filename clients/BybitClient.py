@@ -14,7 +14,7 @@ class BybitClient(TradingClient):
             balance_info = response['result']['list'][0]
             return float(balance_info['totalAvailableBalance'])
         except Exception as e:
-            logging.error(f"Failed to retrieve account balance: {e}")
+            logging.error("Failed to retrieve account balance: %s", e)
             return None
 
     def get_ticker_info(self, symbol):
@@ -25,7 +25,7 @@ class BybitClient(TradingClient):
             ask = float(ticker['ask1Price'])
             return bid, ask
         except Exception as e:
-            logging.error(f"Failed to fetch ticker info for {symbol}: {e}")
+            logging.error("Failed to fetch ticker info for %s: %s", symbol, e)
             return None, None
 
     def get_position_for_symbol(self, symbol):
@@ -33,7 +33,7 @@ class BybitClient(TradingClient):
             response = self.client.get_positions(category="inverse", symbol=symbol)
             return response
         except Exception as e:
-            logging.error(f"Failed to retrieve position for {symbol}: {e}")
+            logging.error("Failed to retrieve position for %s: %s", symbol, e)
             return None
 
     def set_leverage(self, symbol, leverage):
@@ -45,9 +45,9 @@ class BybitClient(TradingClient):
                 sellLeverage=leverage_str,
                 category='inverse'
             )
-            logging.info(f"Leverage set to {leverage}x for {symbol}")
+            logging.info("Leverage set to %sx for %s", leverage, symbol)
         except Exception as e:
-            logging.error(f"Failed to set leverage for {symbol}: {e}")
+            logging.error("Failed to set leverage for %s: %s", symbol, e)
 
     def fetch_historical_data(self, symbol, interval, period):
         try:
@@ -70,10 +70,10 @@ class BybitClient(TradingClient):
                 data = data.astype(float)
                 return data
             else:
-                logging.error(f"Failed to fetch historical data: {response['retMsg']}")
+                logging.error("Failed to fetch historical data: %s", response['retMsg'])
                 return pd.DataFrame()
         except Exception as e:
-            logging.error(f"Error fetching historical data for {symbol}: {e}")
+            logging.error("Error fetching historical data for %s: %s", symbol, e)
             return pd.DataFrame()
 
     def calculate_ema(self, symbol, interval, period):
@@ -92,9 +92,9 @@ class BybitClient(TradingClient):
                 price=price,
                 order_type="Limit"
             )
-            logging.info(f"Placed limit order for {qty} of {symbol} at {price}")
+            logging.info("Placed limit order for %s of %s at %s", qty, symbol, price)
         except Exception as e:
-            logging.error(f"Failed to place order for {symbol}: {e}")
+            logging.error("Failed to place order for %s: %s", symbol, e)
 
     def close_position(self, symbol, qty):
         try:
@@ -109,14 +109,14 @@ class BybitClient(TradingClient):
                     order_type="Limit",
                     reduceOnly=True
                 )
-                logging.info(f"Limit sell order placed at {ask} for {qty} of {symbol}")
+                logging.info("Limit sell order placed at %s for %s of %s", ask, qty, symbol)
                 break
         except Exception as e:
-            logging.error(f"Failed to close position for {symbol}: {e}")
+            logging.error("Failed to close position for %s: %s", symbol, e)
 
     def cancel_all_open_orders(self, symbol):
         try:
             self.client.cancel_all_orders(category="inverse", symbol=symbol)
             logging.info("All open orders cancelled successfully.")
         except Exception as e:
-            logging.error(f"Failed to cancel orders: {e}")
+            logging.error("Failed to cancel orders: %s", e)
@@ -10,14 +10,6 @@ class BybitClient:
     def __init__(self, api_key, api_secret, testnet):
         self.client = HTTP(testnet=testnet, api_key=api_key, api_secret=api_secret)
 
-    def get_account_balance(self):
-        try:
-            balance_info = self.client.get_wallet_balance(accountType='UNIFIED', coin='USDT')['result']['list'][0]
-            return float(balance_info['totalAvailableBalance'])
-        except Exception as e:
-            logging.error(f'Error on retrieving balance: {e}')
-            return None
-
     def get_ticker_info(self, symbol):
         ticker_info = self.client.get_tickers(category='inverse', symbol=symbol)
         highest_ask = float(ticker_info['result']['list'][0]['ask1Price'])
@@ -39,11 +31,11 @@ class BybitClient:
                                                 sellLeverage=leverage_string,
                                                 category='linear')
             if response['ret_code'] == 0:
-                logging.info(f"Leverage set to {leverage}x for {symbol}")
+                logging.info("Leverage set to %sx for %s", leverage, symbol)
             else:
-                logging.debug(f"Couldn't sett leverage for {symbol}, perhaps already correct")
+                logging.debug("Couldn't sett leverage for %s, perhaps already correct", symbol)
         except Exception as e:
-            logging.debug(f"Couldn't sett leverage for {symbol}: {e}")
+            logging.debug("Couldn't sett leverage for %s: %s", symbol, e)
 
     def get_ema(self, symbol, interval=5, period=200):
         historical_data = self.fetch_historical_data(symbol, interval, period)
@@ -98,7 +90,7 @@ class BybitClient:
 
             logging.info("All open orders cancelled successfully.")
         except Exception as e:
-            logging.info(f"Error cancelling orders: {e}")
+            logging.info("Error cancelling orders: %s", e)
 
     def fetch_historical_data(self, symbol, interval, period):
         # Initialize HTTP session
@@ -134,7 +126,7 @@ class BybitClient:
             data['close'] = data['close'].astype(float)
             return data
         else:
-            logging.error(f"Error fetching historical data: {response['retMsg']}")
+            logging.error("Error fetching historical data: %s", response['retMsg'])
             return pd.DataFrame()  # Return an empty DataFrame on error
 
     def close_position(self, symbol, qty):
@@ -146,13 +138,13 @@ class BybitClient:
                 # Place a limit order at the lowest ask price to increase the chance of execution
                 self.client.place_order(symbol=symbol, category='linear', isLeverage='1', side="Sell",
                                         price=lowest_ask, order_type="Limit", qty=qty, reduceOnly=True)
-                logging.info(f"Limit sell order placed at lowest ask {lowest_ask} for {qty} of {symbol}.")
+                logging.info("Limit sell order placed at lowest ask %s for %s of %s.", lowest_ask, qty, symbol)
 
                 time.sleep(10)  # Wait for 10 seconds
 
                 # Check if the position is closed
                 if self.is_position_closed(symbol, qty):
-                    logging.info(f"Position closed for {qty} of {symbol}.")
+                    logging.info("Position closed for %s of %s.", qty, symbol)
                     break
 
                 # Fetch the current lowest ask price again
@@ -161,13 +153,13 @@ class BybitClient:
                 # If the new lowest ask price is lower than our order price, cancel the previous order and place a new one
                 if new_lowest_ask < lowest_ask:
                     self.cancel_all_open_orders(symbol)
-                    logging.info(f"Cancelled previous order. New lowest ask is lower at {new_lowest_ask}.")
+                    logging.info("Cancelled previous order. New lowest ask is lower at %s.", new_lowest_ask)
                 else:
                     logging.info(
                         "Current lowest ask is not lower than the order price. Checking again next iteration.")
 
         except Exception as e:
-            logging.error(f"Failed to close position for {symbol}: {e}")
+            logging.error("Failed to close position for %s: %s", symbol, e)
 
     def is_position_closed(self, symbol, qty):
         position = self.get_position_for_symbol(symbol)
@@ -186,23 +178,23 @@ class BybitClient:
             balance_info = self.client.get_wallet_balance(accountType='UNIFIED', coin='USDT')['result']['list'][0]
             return float(balance_info['totalWalletBalance'])
         except Exception as e:
-            logging.error(f'Error on retrieving balance: {e}')
+            logging.error('Error on retrieving balance: %s', e)
 
     def define_instrument_info(self, symbol):
         try:
             instrument_infos = self.client.get_instruments_info(category='linear', symbol=symbol)['result']['list']
             info = instrument_infos[0]['lotSizeFilter']
-            logging.info(f"Instrument info: {info}")
+            logging.info("Instrument info: %s", info)
 
             return float(info['minOrderQty']), float(info['maxOrderQty']), float(info['qtyStep'])
         except Exception as e:
-            logging.error(f"ERROR: Unable to determine lotSize for symbol {symbol}: {e}")
+            logging.error("ERROR: Unable to determine lotSize for symbol %s: %s", symbol, e)
             return None, None, None
 
     def place_order(self, symbol, qty, price):
         try:
             self.client.place_order(symbol=symbol, category='linear', isLeverage='1', side="Buy", order_type="Limit",
                                     qty=qty, price=price)
-            logging.info(f"Placed limit buy order for {qty} of {symbol} at {price}")
+            logging.info("Placed limit buy order for %s of %s at %s", qty, symbol, price)
         except Exception as e:
-            logging.info(f"Failed to place order for {symbol}: {e}")
+            logging.info("Failed to place order for %s: %s", symbol, e)
@@ -7,9 +7,12 @@ from math import trunc
 
 import pandas as pd
 import requests
+from requests.adapters import HTTPAdapter
 
 from clients.TradingClient import TradingClient
 
+_CLOSE_SIDE_FOR_POS = {"Long": "Sell", "Short": "Buy"}  # Order side that reduces a position
+
 
 class PhemexAPIException(TradingClient, Exception):
     def __init__(self, response):
@@ -36,6 +39,9 @@ class PhemexAPIException(TradingClient, Exception):
 class PhemexClient():
     MAIN_NET_API_URL = 'https://api.phemex.com'
     TEST_NET_API_URL = 'https://testnet-api.phemex.com'
+    HTTP_POOL_MAXSIZE = 32  # Matches the upper bound of asyncio's default to_thread worker count
+    TICKER_CACHE_TTL = 1.0  # Seconds a ticker stays valid, long enough to cover a single workflow tick
+    ACCOUNT_CACHE_TTL = 1.0  # Seconds the account positions response is shared between balance and position lookups
 
     def __init__(self, api_key, api_secret, logger, testnet=False):
         self.api_key = api_key
@@ -43,6 +49,12 @@ class PhemexClient():
         self.logger = logger
         self.api_URL = self.TEST_NET_API_URL if testnet else self.MAIN_NET_API_URL
         self.session = requests.session()
+        # Keep enough idle connections to the API host alive for all concurrently running symbols
+        self.session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=self.HTTP_POOL_MAXSIZE))
+        self._ticker_cache = {}
+        self._account_positions_cache = None
+        self._products_by_symbol = None
+        self._instrument_info_cache = {}
 
     def _send_request(self, method, endpoint, params=None, body=None):
         if params is None:
@@ -57,17 +69,18 @@ class PhemexClient():
             body_str = json.dumps(body, separators=(',', ':'))
             message += body_str
         signature = hmac.new(self.api_secret.encode('utf-8'), message.encode('utf-8'), hashlib.sha256)
-        self.session.headers.update({
+        # Signed headers are passed per request, the session is shared between concurrently running symbols
+        headers = {
             'x-phemex-request-signature': signature.hexdigest(),
             'x-phemex-request-expiry': expiry,
             'x-phemex-access-token': self.api_key,
             'Content-Type': 'application/json'
-        })
+        }
 
         url = self.api_URL + endpoint
         if query_string:
             url += '?' + query_string
-        response = self.session.request(method, url, data=body_str.encode())
+        response = self.session.request(method, url, data=body_str.encode(), headers=headers)
         if not str(response.status_code).startswith('2'):
             raise PhemexAPIException(response)
         try:
@@ -80,9 +93,19 @@ class PhemexClient():
             raise PhemexAPIException(response)
         return res_json
 
+    def _get_account_positions(self):
+        # Balance and positions are served by the same endpoint, share a single response within a tick
+        cached = self._account_positions_cache
+        if cached and time.monotonic() - cached[0] < self.ACCOUNT_CACHE_TTL:
+            return cached[1]
+
+        response = self._send_request("GET", "/g-accounts/positions", {'currency': 'USDT'})
+        self._account_positions_cache = (time.monotonic(), response)
+        return response
+
     def get_account_balance(self):
         try:
-            response = self._send_request("GET", "/g-accounts/positions", {'currency': 'USDT'})
+            response = self._get_account_positions()
             balance_info = response['data']['account']
             usdt_balance = balance_info.get('accountBalanceRv', 0)
             used_balance = balance_info.get('totalUsedBalanceRv', 0)
@@ -97,12 +120,17 @@ class PhemexClient():
             return None
 
     def get_ticker_info(self, symbol):
+        cached = self._ticker_cache.get(symbol)
+        if cached and time.monotonic() - cached[0] < self.TICKER_CACHE_TTL:
+            return cached[1]
+
         try:
             response = self._send_request("GET", "/md/v3/ticker/24hr", {'symbol': symbol})
-            logging.debug(f"response from ticker info: {response}")
+            logging.debug("response from ticker info: %s", response)
             ticker = response['result']
             highest_bid = float(ticker['bidRp'])
             highest_ask = float(ticker['askRp'])
+            self._ticker_cache[symbol] = (time.monotonic(), (highest_bid, highest_ask))
             return highest_bid, highest_ask
         except PhemexAPIException as e:
             self.logger.error(
@@ -116,7 +144,7 @@ class PhemexClient():
 
     def get_position_for_symbol(self, symbol, pos_side):
         try:
-            response = self._send_request("GET", "/g-accounts/positions", {'currency': 'USDT'})
+            response = self._get_account_positions()
             positions = response['data']['positions']
             position = next((p for p in positions if p['symbol'] == symbol
                              and p["posSide"] == pos_side and float(p['sizeRq']) > 0), None)
@@ -140,11 +168,12 @@ class PhemexClient():
                     'margin_level': margin_level
                 }
             else:
-                self.logger.info(
-                    "No position found for symbol",
-                    extra={
-                        "symbol": symbol
-                    })
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "No position found for symbol",
+                        extra={
+                            "symbol": symbol
+                        })
                 return None
         except PhemexAPIException as e:
             self.logger.error(
@@ -166,7 +195,9 @@ class PhemexClient():
         return round(margin_level, 2)
 
     def define_instrument_info(self, symbol):
-        # Send request to Phemex API to retrieve all product information
+        # Lot size rules are static exchange data, resolve them once per symbol for the lifetime of the client
+        if symbol in self._instrument_info_cache:
+            return self._instrument_info_cache[symbol]
 
         product_info = self.get_product_info(symbol)
         if product_info:
@@ -174,16 +205,18 @@ class PhemexClient():
             qty_step_size = float(product_info.get('qtyStepSize', 0))
             max_order_qty_rq = float(product_info.get('maxOrderQtyRq', 0))
             min_order_qty = qty_step_size  # Assuming min_order_qty is the same as qty_step_size
-            self.logger.info(
-                "Instrument info",
-                extra={
-                    "json": {
-                        "symbol": symbol,
-                        "min_order_qty": min_order_qty,
-                        "max_order_qty_rq": max_order_qty_rq,
-                        "qty_step_size": qty_step_size
-                    }
-                })
+            self._instrument_info_cache[symbol] = (min_order_qty, max_order_qty_rq, qty_step_size)
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Instrument info",
+                    extra={
+                        "json": {
+                            "symbol": symbol,
+                            "min_order_qty": min_order_qty,
+                            "max_order_qty_rq": max_order_qty_rq,
+                            "qty_step_size": qty_step_size
+                        }
+                    })
             return min_order_qty, max_order_qty_rq, qty_step_size
         else:
             self.logger.error(
@@ -196,32 +229,36 @@ class PhemexClient():
             return None, None, None
 
     def get_product_info(self, symbol):
-        try:
-            response = self._send_request("GET", "/public/products")
-
-            if response['code'] == 0:
-                products = response['data']['perpProductsV2']
-                # Find the product matching the specified symbol
-                product_info = next((item for item in products if item['symbol'] == symbol), None)
-                return product_info
-            else:
+        if self._products_by_symbol is None:
+            try:
+                # Send request to Phemex API to retrieve all product information
+                response = self._send_request("GET", "/public/products")
+
+                if response['code'] == 0:
+                    # Index the products by symbol once, the list covers every symbol this client trades
+                    products = response['data']['perpProductsV2']
+                    self._products_by_symbol = {item['symbol']: item for item in products}
+                else:
+                    self.logger.error(
+                        "Failed to retrieve products.",
+                        extra={
+                            "symbol": symbol,
+                            "json": {"error_description": response['msg']
+                                     }}
+                    )
+                    return None
+            except Exception as e:
                 self.logger.error(
-                    "Failed to retrieve products.",
+                    "Unable to determine lot size for symbol",
                     extra={
                         "symbol": symbol,
-                        "json": {"error_description": response['msg']
+                        "json": {"error_description": e
                                  }}
                 )
-                return None, None, None
-        except Exception as e:
-            self.logger.error(
-                "Unable to determine lot size for symbol",
-                extra={
-                    "symbol": symbol,
-                    "json": {"error_description": e
-                             }}
-            )
-            return None, None, None
+                return None
+
+        # Find the product matching the specified symbol
+        return self._products_by_symbol.get(symbol)
 
     def set_leverage(self, symbol, leverage):
         try:
@@ -315,7 +352,7 @@ class PhemexClient():
                 }
             )
 
-            logging.debug(f"Kline data from API: {response}")
+            logging.debug("Kline data from API: %s", response)
 
             if response['code'] == 0:
                 rows = response['data']['rows']
@@ -360,32 +397,48 @@ class PhemexClient():
             return pd.DataFrame()
 
     def get_ema(self, symbol, interval=5, period=200):
-        historical_data = self.fetch_historical_data(symbol, interval, period)
-        if not historical_data.empty:
-            ema = historical_data['close'].ewm(span=period, adjust=False).mean()
-            return ema.iloc[-1]
-        else:
-            return None
+        return self.get_emas(symbol, interval, (period,))[period]
+
+    def get_emas(self, symbol, interval, periods):
+        """
+        Calculate the EMA for several periods of the same interval from a single kline request.
+
+        :param symbol: Trading pair symbol, e.g., 'BTCUSDT'.
+        :param interval: Interval in minutes, e.g., 1, 5, 15.
+        :param periods: EMA periods to calculate, e.g., (50, 200).
+        :return: Dict mapping each period to its most recent EMA value, or None if no data was retrieved.
+        """
+        historical_data = self.fetch_historical_data(symbol, interval, max(periods))
+        if historical_data.empty:
+            return {period: None for period in periods}
+
+        emas = {}
+        for period in periods:
+            # Use only the most recent 'period' data points, as if they were fetched separately
+            ema = historical_data['close'].tail(period).ewm(span=period, adjust=False).mean()
+            emas[period] = ema.iloc[-1]
+        return emas
 
     def place_order(self, symbol, qty, price=None, side="Buy", order_type="Limit", time_in_force="GoodTillCancel",
                     pos_side="Long", reduce_only=False):
 
-        self.logger.debug(
-            "Placing order",
-            extra={
-                "symbol": symbol,
-                "json": {
-                    "qty": qty,
-                    "price": price,
-                    "side": side,
-                    "pos_side": pos_side,
-                    "order_type": order_type,
-                    "reduce_only": reduce_only
-                }
-            })
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Placing order",
+                extra={
+                    "symbol": symbol,
+                    "json": {
+                        "qty": qty,
+                        "price": price,
+                        "side": side,
+                        "pos_side": pos_side,
+                        "order_type": order_type,
+                        "reduce_only": reduce_only
+                    }
+                })
         try:
             # Generate a unique client order ID
-            cl_ord_id = f"order_{int(time.time() * 1000)}"
+            cl_ord_id = f"order_{int(time.time() * 1000)}_{symbol}"
 
             # Retrieve instrument information to get the price scale
             min_order_qty, max_order_qty, qty_step = self.define_instrument_info(symbol)
@@ -413,14 +466,15 @@ class PhemexClient():
 
             # Send the order request
             response = self._send_request("POST", "/g-orders", body=order)
-            self.logger.info(
-                "Placed order",
-                extra={
-                    "symbol": symbol,
-                    "json": {
-                        "response": response
-                    }
-                })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Placed order",
+                    extra={
+                        "symbol": symbol,
+                        "json": {
+                            "response": response
+                        }
+                    })
 
         except PhemexAPIException as e:
             self.logger.error(
@@ -433,7 +487,7 @@ class PhemexClient():
 
     def close_position(self, symbol, qty, pos_side):
         try:
-            side = "Sell" if pos_side == "Long" else "Buy"
+            side = _CLOSE_SIDE_FOR_POS[pos_side]
 
             position = self.get_position_for_symbol(symbol=symbol, pos_side=pos_side)
             _, lowest_ask = self.get_ticker_info(symbol)
@@ -442,17 +496,18 @@ class PhemexClient():
                 self.place_order(symbol=symbol, qty=qty, price=lowest_ask, pos_side=pos_side, side=side,
                                  reduce_only=True)
 
-                self.logger.debug(
-                    "Close position requested",
-                    extra={
-                        "symbol": symbol,
-                        "json": {
-                            "position": position,
-                            "price": lowest_ask,
-                            "qty": qty,
-                            "pos_side": pos_side
-                        }
-                    })
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(
+                        "Close position requested",
+                        extra={
+                            "symbol": symbol,
+                            "json": {
+                                "position": position,
+                                "price": lowest_ask,
+                                "qty": qty,
+                                "pos_side": pos_side
+                            }
+                        })
 
         except PhemexAPIException as e:
             self.logger.error(
@@ -467,19 +522,21 @@ class PhemexClient():
         try:
             # Cancel active orders, including triggered conditional orders
             self._send_request("DELETE", "/g-orders/all", params={"symbol": symbol, "untriggered": "false"})
-            self.logger.info(
-                "Cancelled active orders",
-                extra={
-                    "symbol": symbol
-                })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Cancelled active orders",
+                    extra={
+                        "symbol": symbol
+                    })
 
             # Cancel untriggered conditional orders
             self._send_request("DELETE", "/g-orders/all", params={"symbol": symbol, "untriggered": "true"})
-            self.logger.info(
-                'Cancelled untriggered conditional orders.',
-                extra={
-                    "symbol": symbol
-                })
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    'Cancelled untriggered conditional orders.',
+                    extra={
+                        "symbol": symbol
+                    })
         except PhemexAPIException as e:
             try:
                 self.logger.error(
@@ -490,4 +547,4 @@ class PhemexClient():
                                  }}
                 )
             except Exception as e1:
-                logging.error("unresolved error:", e)
+                logging.error("unresolved error: %s", e)
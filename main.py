@@ -9,6 +9,12 @@ from strategies.MartingaleTradingStrategy import MartingaleTradingStrategy
 from workflows.MartingaleTradingWorkflow import MartingaleTradingWorkflow
 from clients.PhemexClient import PhemexClient
 
+# Create the structured log handler once at import, the JSON format spec is only parsed here
+_LOG_HANDLER = logging.StreamHandler()
+_LOG_HANDLER.setFormatter(json.JsonFormatter(
+    '%(asctime)s %(levelname)s %(message)s %(symbol)s %(action)s %(json)s'
+))
+
 
 async def main():
     # Remove all existing handlers to prevent duplicate logging
@@ -19,16 +25,8 @@ async def main():
     # Set the logging level globally
     root_logger.setLevel(logging.INFO)
 
-    # Create a StreamHandler for structured logging
-    log_handler = logging.StreamHandler()
-
-    # Define JSON log formatter
-    formatter = json.JsonFormatter(
-        '%(asctime)s %(levelname)s %(message)s %(symbol)s %(action)s %(json)s'
-    )
-
-    log_handler.setFormatter(formatter)
-    root_logger.addHandler(log_handler)
+    # Attach the shared structured logging handler
+    root_logger.addHandler(_LOG_HANDLER)
 
     # Ensure there is no "extra" module-based logger overriding the root logger
     logger = logging.getLogger(__name__)
@@ -59,8 +57,16 @@ async def main():
 
     workflow = MartingaleTradingWorkflow(strategy, logger)
 
+    # Group the sides per symbol, both sides of a symbol share its open orders
+    symbol_groups = {}
     for symbol, pos_side, automatic_mode in symbol_side_map:
-        await execute_symbol_strategy(symbol, workflow, ema_interval, pos_side, automatic_mode)  # Sequentially process each symbol
+        symbol_groups.setdefault(symbol, []).append((pos_side, automatic_mode))
+
+    # Symbols are independent and network bound, so process them concurrently
+    await asyncio.gather(*(
+        execute_symbol_sides(symbol, workflow, ema_interval, sides)
+        for symbol, sides in symbol_groups.items()
+    ))
 
 
 async def parse_symbols(symbol_sides):
@@ -85,6 +91,12 @@ async def parse_symbols(symbol_sides):
     return symbol_side_map
 
 
+async def execute_symbol_sides(symbol, workflow, ema_interval, sides):
+    # Sequentially process the sides of a symbol, prepare_strategy cancels all open orders of the symbol
+    for pos_side, automatic_mode in sides:
+        await execute_symbol_strategy(symbol, workflow, ema_interval, pos_side, automatic_mode)
+
+
 async def execute_symbol_strategy(symbol, workflow, ema_interval, pos_side, automatic_mode):
     try:
         # Execute the trading strategy for the specific symbol
@@ -95,9 +107,9 @@ async def execute_symbol_strategy(symbol, workflow, ema_interval, pos_side, auto
             pos_side=pos_side,
             automatic_mode=automatic_mode
         )
-        logging.info(f'Successfully executed strategy for {symbol}')
+        logging.info('Successfully executed strategy for %s', symbol)
     except Exception as e:
-        logging.error(f'Error executing strategy for {symbol}: {e}')
+        logging.error('Error executing strategy for %s: %s', symbol, e)
 
 
 # Run the asyncio event loop
@@ -1,6 +1,11 @@
-from _decimal import ROUND_DOWN, Decimal
+import logging
+import time
+from _decimal import Decimal
+from dataclasses import asdict
+from functools import lru_cache
 
 from clients import TradingClient
+from strategies.PositionView import PositionView
 from strategies.TradingStrategy import TradingStrategy
 
 
@@ -14,8 +19,29 @@ CONFIG = {
     'buy_below_percentage': 0.04,
 }
 
+EMA_CACHE_TTL = 30  # Seconds to reuse an EMA, shares it between the Long and Short side of a symbol within a run
+
+_SIDE_FOR_POS = {"Long": "Buy", "Short": "Sell"}  # Order side that opens or adds to a position
+_PRICE_IDX = {"Long": 0, "Short": 1}  # Index into the (bid, ask) ticker tuple to price an order with
+
+
+@lru_cache(maxsize=None)
+def _step_scale(qty_step):
+    """
+    Express a qty step as integers: returns (scale, step_units) where qty_step == step_units / scale.
+    """
+    exponent = Decimal(str(qty_step)).normalize().as_tuple().exponent
+    scale = 10 ** max(-exponent, 0)
+    return scale, round(qty_step * scale)
+
 
 class MartingaleTradingStrategy(TradingStrategy):
+    # Position size thresholds (% of balance) and the fraction to close, highest threshold first
+    _PROFIT_THRESHOLDS = (
+        (10, 0.5, "Closing 50% of position due to balance > 10%"),
+        (7.50, 0.33, "Closing 33% of position due to balance > 7.5%"),
+    )
+
     def __init__(self, client: TradingClient, logger):
         super().__init__(client, logger)
 
@@ -24,23 +50,55 @@ class MartingaleTradingStrategy(TradingStrategy):
         self.profit_pnl = CONFIG['profit_pnl']
         self.proportion_of_balance = CONFIG['begin_size_of_balance']
         self.buy_until_limit = CONFIG['buy_until_limit']
+        self._ema_cache = {}
 
     def custom_round(self, number, min_qty, max_qty, qty_step):
-        number = Decimal(str(number))
-        min_qty = Decimal(str(min_qty))
-        max_qty = Decimal(str(max_qty))
-        qty_step = Decimal(str(qty_step))
+        scale, step_units = _step_scale(qty_step)
 
-        # Perform floor rounding
-        rounded_qty = (number / qty_step).quantize(Decimal('1'), rounding=ROUND_DOWN) * qty_step
+        # Perform floor rounding in integer units of the scale
+        units = int(number * scale)
+        # Correct float noise of the multiplication, e.g. 0.29 * 100 == 28.999999999999996
+        if (units + 1) / scale <= number:
+            units += 1
+        elif units / scale > number:
+            units -= 1
+        rounded_qty = (units // step_units) * step_units / scale
 
         # Clamp the result within the min and max bounds
         return max(min(rounded_qty, max_qty), min_qty)
 
-    def is_valid_position(self, position, current_price, ema_200, pos_side):
-        return position and position['margin_level'] < 2 \
-            or (pos_side == 'Long' and current_price > ema_200) \
-            or (pos_side == 'Short' and current_price < ema_200)
+    def _get_emas(self, symbol, interval, periods):
+        """
+        Retrieve the EMAs of the symbol for the given periods, reusing values fetched within EMA_CACHE_TTL seconds.
+        """
+        now = time.monotonic()
+        emas = {}
+        missing_periods = []
+        for period in periods:
+            cached = self._ema_cache.get((symbol, interval, period))
+            if cached and now - cached[0] < EMA_CACHE_TTL:
+                emas[period] = cached[1]
+            else:
+                missing_periods.append(period)
+
+        if missing_periods:
+            fetched = self.client.get_emas(symbol=symbol, interval=interval, periods=tuple(missing_periods))
+            for period, ema in fetched.items():
+                if ema is not None:
+                    self._ema_cache[(symbol, interval, period)] = (now, ema)
+            emas.update(fetched)
+
+        return emas
+
+    def can_act(self, position, automatic_mode):
+        """
+        Without an open position only automatic mode can open one, otherwise there is nothing to manage.
+        """
+        return bool(position) or automatic_mode
+
+    def is_valid_position(self, position, current_price, ema, is_long):
+        return bool(position and position.margin_level < 2) \
+            or (current_price > ema if is_long else current_price < ema)
 
     def manage_position(self, symbol, current_price, ema_200_1h, ema_200, ema_50, position, total_balance, pos_side, automatic_mode):
         """
@@ -48,68 +106,52 @@ class MartingaleTradingStrategy(TradingStrategy):
         """
 
         conclusion = "Nothing changed"
+        is_long = pos_side == "Long"
+        side = _SIDE_FOR_POS[pos_side]
 
         if position:
-            # Extract position details
-            position_value = float(position['positionValue'])
-            unrealised_pnl = float(position['unrealisedPnl'])
-            upnl_percentage = float(position['upnlPercentage'])
-            position_size_percentage = float(position['position_size_percentage'])
-            side = "Buy" if pos_side == "Long" else "Sell"
-            position_factor = position_value / total_balance
-            margin_level = float(position.get('margin_level', 0))
-
-            # Validate if adding to position is allowed
-            valid_position = self.is_valid_position(position, current_price, ema_50, pos_side)
+            unrealised_pnl = position.unrealised_pnl
+            upnl_percentage = position.upnl_percentage
+            position_factor = position.position_factor
 
             # ✅ 1. Manage profitable positions
             if (
                     unrealised_pnl/total_balance > self.profit_threshold  # If we reached our min profit amount
                     and position_factor >= self.buy_until_limit  # And we bought the minimum amount
             ):
-                conclusion = self.manage_profitable_position(symbol, position, upnl_percentage,
-                                                             position_size_percentage, pos_side)
+                conclusion = self.manage_profitable_position(symbol, position, pos_side)
 
             # ✅ 2. Check conditions to add to the position
             elif (
-                    margin_level < 2  # Ensure margin level is safe
+                    position.margin_level < 2  # Ensure margin level is safe
                     or position_factor < self.buy_until_limit  # Position size is within limits
                     or (unrealised_pnl < 0 and upnl_percentage < -0.05  # Buy at a dip, but only if down more than 5%
-                        and valid_position)  # Only on right side of EMA's
+                        and self.is_valid_position(position, current_price, ema_50, is_long))  # Right side of EMA's
             ):
-                conclusion = self.add_to_position(symbol, current_price, total_balance, position_value,
-                                                  upnl_percentage, side, pos_side)
+                conclusion = self.add_to_position(symbol, current_price, position.position_value, upnl_percentage,
+                                                  side, pos_side)
 
         # ✅ 3. Open a new position in automatic mode if conditions match
-        elif automatic_mode and (
-                (pos_side == "Long" and current_price > ema_200_1h) or
-                (pos_side == "Short" and current_price < ema_200_1h)
-        ):
-            conclusion = self.open_new_position(symbol, current_price, total_balance, pos_side)
+        elif automatic_mode and (current_price > ema_200_1h if is_long else current_price < ema_200_1h):
+            conclusion = self.open_new_position(symbol, current_price, total_balance, side, pos_side)
 
         return conclusion
 
-    def manage_profitable_position(self, symbol, position, pnl_percentage, position_value_percentage_of_total_balance,
-                                   pos_side):
+    def manage_profitable_position(self, symbol, position, pos_side):
         """
         Manage the profitable position by partially or fully closing it based on thresholds.
         """
-        size = float(position['size'])
-        unrealised_pnl = float(position['unrealisedPnl'])
-
-        # Define thresholds and corresponding actions
-        thresholds = [
-            (7.50, 0.33, "Closing 33% of position due to balance > 7.5%"),
-            (10, 0.5, "Closing 50% of position due to balance > 10%")
-        ]
+        size = position.size
+        pnl_percentage = position.upnl_percentage
+        position_value_percentage_of_total_balance = position.position_size_percentage
 
         # Check thresholds and execute actions
-        for threshold, close_fraction, message in thresholds:
+        for threshold, close_fraction, message in self._PROFIT_THRESHOLDS:
             if position_value_percentage_of_total_balance > threshold:
                 min_qty, max_qty, qty_step = self.client.define_instrument_info(symbol)
                 qty = self.custom_round(size * close_fraction, min_qty, max_qty, qty_step)
                 self.client.close_position(symbol, qty, pos_side)
-                return f"{message} (Current: {position_value_percentage_of_total_balance}%)"
+                return f"{message} (Current: {position_value_percentage_of_total_balance:.2f}%)"
 
         # Leave only min amount if profit target is reached
         if pnl_percentage > self.profit_pnl:
@@ -118,93 +160,130 @@ class MartingaleTradingStrategy(TradingStrategy):
 
         # No action needed
         return (
-            f"Position above EMA but no change: unrealised={unrealised_pnl} vs target={self.profit_threshold}, "
+            f"Position above EMA but no change: unrealised={position.unrealised_pnl} vs target={self.profit_threshold}, "
             f"pnl_percentage={pnl_percentage} vs target={self.profit_pnl}, "
-            f"position size={position_value_percentage_of_total_balance}% of balance"
+            f"position size={position_value_percentage_of_total_balance:.2f}% of balance"
         )
 
-    def add_to_position(self, symbol, current_price, total_balance, position_value, pnl_percentage, side, pos_side):
-        order_qty = self.calculate_order_quantity(symbol, total_balance, position_value, current_price, pnl_percentage)
+    def add_to_position(self, symbol, current_price, position_value, pnl_percentage, side, pos_side):
+        order_qty = self._calc_topup_qty(symbol, position_value, current_price, pnl_percentage)
         self.client.place_order(symbol=symbol, qty=order_qty, price=current_price, pos_side=pos_side, side=side)
         return "Added to position"
 
-    def open_new_position(self, symbol, current_price, total_balance, pos_side):
-        side = "Buy" if pos_side == "Long" else "Sell"
-        order_qty = self.calculate_order_quantity(symbol, total_balance, 0, current_price, 0)
+    def open_new_position(self, symbol, current_price, total_balance, side, pos_side):
+        order_qty = self._calc_initial_qty(symbol, total_balance, current_price)
         self.client.place_order(symbol=symbol, qty=order_qty, price=current_price, pos_side=pos_side, side=side)
         return "Opened new position"
 
-    def retrieve_information(self, ema_interval, symbol, pos_side):
-        position = self.client.get_position_for_symbol(symbol, pos_side)
-        current_bid, current_ask = self.client.get_ticker_info(symbol)
+    def retrieve_information(self, ema_interval, symbol, pos_side, automatic_mode=True):
+        current_price, position, total_balance = self._retrieve_position_and_balance(symbol, pos_side)
+
+        # A position below 200% margin level is managed regardless of the EMA side, skip the kline requests
+        if position and position.margin_level < 2:
+            ema_200_1h, ema_200, ema_50 = None, None, None
+        # Nothing to evaluate the EMAs for when the side cannot act
+        elif not self.can_act(position, automatic_mode):
+            ema_200_1h, ema_200, ema_50 = None, None, None
+        else:
+            # The 1H EMA is only used to open a new position
+            ema_200_1h, ema_200, ema_50 = self._retrieve_emas(ema_interval, symbol, include_1h=not position)
+
+        return current_price, ema_200_1h, ema_200, ema_50, position, total_balance
+
+    def _retrieve_position_and_balance(self, symbol, pos_side):
+        raw_position = self.client.get_position_for_symbol(symbol, pos_side)
+        ticker = self.client.get_ticker_info(symbol)
         total_balance, used_balance = self.client.get_account_balance()
 
-        self.logger.info(
-            "Balance info",
-            extra={
-                "json": {
-                    "total_balance": total_balance,
-                    "used_balance": used_balance
-                }
-            })
-
-        ema_50 = self.client.get_ema(symbol=symbol, interval=ema_interval, period=50)
-        ema_200 = self.client.get_ema(symbol=symbol, interval=ema_interval, period=200)
-        ema_200_1h = self.client.get_ema(symbol=symbol, interval=60,
-                                         period=200)  # 1H EMA is leading to identify Long or Short Bias
-        self.logger.info(
-            "EMA info",
-            extra={
-                "symbol": symbol,
-                "json": {
-                    "ema_interval": ema_interval,
-                    "ema_50": ema_50,
-                    "ema_200": ema_200,
-                    "ema_200_1h": ema_200_1h
-                }
-            })
-
-        current_price = current_bid if pos_side == 'Long' else current_ask
+        # Only build the structured log payloads when INFO records are actually emitted
+        log_info = self.logger.isEnabledFor(logging.INFO)
+        if log_info:
+            self.logger.info(
+                "Balance info",
+                extra={
+                    "json": {
+                        "total_balance": total_balance,
+                        "used_balance": used_balance
+                    }
+                })
 
-        if position:
-            position_value_percentage_of_total_balance = round(float(position['positionValue']) / total_balance * 100,
-                                                               2)
-            position['position_size_percentage'] = position_value_percentage_of_total_balance
+        current_price = ticker[_PRICE_IDX[pos_side]]
+
+        # Parse the position once, the decision logic only reads its typed fields
+        position = PositionView.from_dict(raw_position, total_balance) if raw_position else None
 
+        if position and log_info:
             self.logger.info(
                 "Position info",
                 extra={
                     "symbol": symbol,
                     "json": {
-                        "position": position
+                        "position": asdict(position)
                     }
                 })
 
-        return current_price, ema_200_1h, ema_200, ema_50, position, total_balance
+        return current_price, position, total_balance
+
+    def _retrieve_emas(self, ema_interval, symbol, include_1h):
+        # EMA 50 and 200 share the same candles, retrieve them with a single kline request
+        emas = self._get_emas(symbol, ema_interval, (50, 200))
+        ema_50, ema_200 = emas[50], emas[200]
+        # 1H EMA is leading to identify Long or Short Bias, cached together with EMA 200 when ema_interval is 60
+        ema_200_1h = self._get_emas(symbol, 60, (200,))[200] if include_1h else None
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "EMA info",
+                extra={
+                    "symbol": symbol,
+                    "json": {
+                        "ema_interval": ema_interval,
+                        "ema_50": ema_50,
+                        "ema_200": ema_200,
+                        "ema_200_1h": ema_200_1h
+                    }
+                })
+
+        return ema_200_1h, ema_200, ema_50
 
     def prepare_strategy(self, symbol, pos_side):
         self.client.cancel_all_open_orders(symbol, pos_side)
         self.client.set_leverage(symbol, self.leverage)
 
     def calculate_order_quantity(self, symbol, total_balance, position_value, current_price, pnl_percentage):
-        min_qty, max_qty, qty_step = self.client.define_instrument_info(symbol)
-
         if position_value == 0:
-            qty = (total_balance * self.proportion_of_balance) * self.leverage / current_price
-        else:
-            qty = (position_value * self.leverage * (-pnl_percentage)) / current_price
+            return self._calc_initial_qty(symbol, total_balance, current_price)
+        return self._calc_topup_qty(symbol, position_value, current_price, pnl_percentage)
 
+    def _calc_initial_qty(self, symbol, total_balance, current_price):
+        """
+        Size the first order of a position as a proportion of the total balance.
+        """
+        min_qty, max_qty, qty_step = self.client.define_instrument_info(symbol)
+        qty = (total_balance * self.proportion_of_balance) * self.leverage / current_price
         qty = self.custom_round(qty, min_qty, max_qty, qty_step)
+        self._log_order_quantity(symbol, current_price, 0, qty)
+        return qty
 
-        self.logger.info(
-            "Calculating order quantity",
-            extra={
-                "symbol": symbol,
-                "json": {
-                    "current_price": current_price,
-                    "pnl_percentage": pnl_percentage,
-                    "calculated_qty": qty
-                }
-            })
-
+    def _calc_topup_qty(self, symbol, position_value, current_price, pnl_percentage):
+        """
+        Size a martingale top-up of an open position from its value and the current loss.
+        """
+        min_qty, max_qty, qty_step = self.client.define_instrument_info(symbol)
+        qty = (position_value * self.leverage * (-pnl_percentage)) / current_price
+        qty = self.custom_round(qty, min_qty, max_qty, qty_step)
+        self._log_order_quantity(symbol, current_price, pnl_percentage, qty)
         return qty
+
+    def _log_order_quantity(self, symbol, current_price, pnl_percentage, qty):
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Calculating order quantity",
+                extra={
+                    "symbol": symbol,
+                    "json": {
+                        "current_price": current_price,
+                        "pnl_percentage": pnl_percentage,
+                        "calculated_qty": qty
+                    }
+                })
@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True, frozen=True)
+class PositionView:
+    """
+    Typed snapshot of an open position, parsed once per tick from the position dict returned by the client.
+    """
+    position_value: float
+    unrealised_pnl: float
+    upnl_percentage: float
+    size: float
+    pos_side: str
+    margin_level: float
+    position_factor: float  # Position value as a fraction of the total balance
+    position_size_percentage: float
+
+    @classmethod
+    def from_dict(cls, position, total_balance):
+        position_value = float(position['positionValue'])
+        position_factor = position_value / total_balance
+        return cls(
+            position_value=position_value,
+            unrealised_pnl=float(position['unrealisedPnl']),
+            upnl_percentage=float(position['upnlPercentage']),
+            size=float(position['size']),
+            pos_side=position['posSide'],
+            margin_level=float(position.get('margin_level', 0)),
+            position_factor=position_factor,
+            position_size_percentage=position_factor * 100
+        )
@@ -14,7 +14,7 @@ class TradingStrategy(ABC):
         pass
 
     @abstractmethod
-    def retrieve_information(self, ema_interval, symbol, pos_side):
+    def retrieve_information(self, ema_interval, symbol, pos_side, automatic_mode=True):
         """
         Fetch all necessary information such as balance, position, and EMA values.
         """
@@ -1,3 +1,5 @@
+import logging
+
 from workflows.Workflow import Workflow
 
 
@@ -8,57 +10,74 @@ class MartingaleTradingWorkflow(Workflow):
 
     def execute(self, symbol, pos_side, ema_interval, automatic_mode):
         try:
-            self.logger.info(
-                "Starting workflow",
-                extra={
-                    "symbol": symbol,
-                    "json": {
-                        "strategy": "MartinGale",
-                        "pos_side": pos_side,
-                        "ema_interval": ema_interval,
-                        "automatic_mode": automatic_mode
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    "Starting workflow",
+                    extra={
+                        "symbol": symbol,
+                        "json": {
+                            "strategy": "MartinGale",
+                            "pos_side": pos_side,
+                            "ema_interval": ema_interval,
+                            "automatic_mode": automatic_mode
+                        }
                     }
-                }
-            )
+                )
 
             # Step 1: Prepare the strategy
             self.strategy.prepare_strategy(symbol, pos_side)
 
             # Step 2: Retrieve required information
             current_price, ema_200_1h, ema_200, ema_50, position, total_balance = self.strategy.retrieve_information(
-                ema_interval, symbol, pos_side
+                ema_interval, symbol, pos_side, automatic_mode
             )
 
+            # No position and automatic mode disabled, the EMAs were not fetched and there is no action to take
+            if not self.strategy.can_act(position, automatic_mode):
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Skipping due to no position and automatic mode disabled",
+                        extra={
+                            "symbol": symbol,
+                            "json": {
+                                "pos_side": pos_side
+                            }
+                        })
+                return
+
             # Step 3: Determine and execute actions based on strategy
-            if self.strategy.is_valid_position(position=position, current_price=current_price, ema_200=ema_200, pos_side=pos_side):
+            is_long = pos_side == "Long"
+            if self.strategy.is_valid_position(position=position, current_price=current_price, ema=ema_200, is_long=is_long):
                 conclusion = self.strategy.manage_position(
                     symbol=symbol, current_price=current_price, ema_200_1h=ema_200_1h,
                     ema_200=ema_200, ema_50=ema_50, position=position, total_balance=total_balance,
                     pos_side=pos_side, automatic_mode=automatic_mode
                 )
-                self.logger.info(
-                    "Position managed",
-                    extra={
-                        "symbol": symbol,
-                        "json": {
-                            "pos_side": pos_side,
-                            "conclusion": conclusion
-                        }
-                    })
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Position managed",
+                        extra={
+                            "symbol": symbol,
+                            "json": {
+                                "pos_side": pos_side,
+                                "conclusion": conclusion
+                            }
+                        })
             else:
-                margin_level = position.get('margin_level', None) if position else None
+                margin_level = position.margin_level if position else None
 
-                self.logger.info(
-                    "Skipping due to wrong EMA side and margin level >= 200%",
-                    extra={
-                        "symbol": symbol,
-                        "json": {
-                            "current_price": current_price,
-                            "ema": ema_200,
-                            "margin_level": margin_level
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(
+                        "Skipping due to wrong EMA side and margin level >= 200%",
+                        extra={
+                            "symbol": symbol,
+                            "json": {
+                                "current_price": current_price,
+                                "ema": ema_200,
+                                "margin_level": margin_level
+                            }
                         }
-                    }
-                )
+                    )
 
         except Exception as e:
-            self.logger.error(f"Error in workflow execution for {symbol}: {e}")
+            self.logger.error("Error in workflow execution for %s: %s", symbol, e)